@@ -1,12 +1,9 @@
+from io import StringIO
 from pathlib import Path
 import re
-from string import Template
 from typing import Type, Any
 
-import black
-import isort
-
-from ..helpers import operation_id_to_function_name
+from ..helpers import APPLICATION_JSON, operation_id_to_function_name, write_file
 
 from .generic import (
     OpenAPIParameterParser,
@@ -15,12 +12,64 @@ from .generic import (
     QueryParamTypedictGenerator
 )
 
+#: Invariant fragments shared across every generated method, hoisted so the
+#: hot builder paths reuse one interned string instead of composing anew.
+_KWARGS = "**kwargs"
+_RETURN_ANY = "-> Any"
+_JSON_CALL_ARG = "json=req_data.dict(exclude_unset=True)"
+
+#: Names the parsers can emit that aren't real schema classes and so must
+#: never be imported from the models module.
+_EXCLUDED_IMPORTS = frozenset({"AnyType", "Metaclass", "NoneType", "Any"})
+
+#: The :py:meth:`str.format` style template for the header of a Manager class
+#: definition; the method bodies are streamed into a buffer after it.
+_TPL_MANAGER_HEADER = '''
+class {class_name}:
+    """
+    This manager class is used to gather methods that call the API endpoints
+    that are associated with the ``{tag}`` tag in the OpenAPI specification.
+
+    Args:
+        base_url: the base URL of the API
+
+    Keyword Args:
+        headers: any headers to send with the requests
+        proxies: any proxies to use when making the requests
+    """
+    #: The OpenAPI tag that this manager is associated with
+    openapi_tag: Final[str] = "{tag}"
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[dict[str, str]] = None,
+        proxies: Optional[dict[str, str]] = None,
+    ) -> None:
+        self.base_url = base_url
+        self.headers = headers
+        self.proxies = proxies
+
+'''
+
 
 class AbstractMethodBuilder:
 
+    #: The builders are stateless; an empty ``__slots__`` keeps them from
+    #: carrying an instance ``__dict__`` anyway.
+    __slots__ = ()
+
+    #: Fully composed method templates keyed by ``(builder class, shape)``
+    #: where shape is ``(has_body, has_path, has_query, is_list,
+    #: has_response_obj)``.  All the shape-dependent branching happens once
+    #: per shape when the composed template is first built; after that,
+    #: building a method is a dict lookup plus one :py:meth:`str.format`.
+    _shape_templates: dict[tuple, str] = {}
+
     def build_method_args(self, info: dict[str, Any]) -> list[str]:
         """
-        Build the list of args and kwargs for the method signature.
+        Build the list of args and kwargs for the method signature, as
+        placeholder fragments for the composed template.
 
         Args:
             info: the function info dict
@@ -30,12 +79,12 @@ class AbstractMethodBuilder:
         """
         method_args: list[str] = []
         if info["request_obj"]:
-            method_args.extend([f'req_data: {info["request_obj"]}'])
+            method_args.append("req_data: {request_obj}")
         if info["path_parameters"]:
-            method_args.append(", ".join(info["path_parameters"]))
+            method_args.append("{path_params}")
         if info["query_parameters"]:
-            method_args.append(f"params: {info['query_parameters']}")
-        method_args.append("**kwargs")
+            method_args.append("params: {query_parameters}")
+        method_args.append(_KWARGS)
         return method_args
 
     def build_request_call_args(self, info: dict[str, Any]) -> list[str]:
@@ -51,48 +100,109 @@ class AbstractMethodBuilder:
         """
         requests_call_args = []
         if info["request_obj"]:
-            requests_call_args.append("json=req_data.dict(exclude_unset=True)")
-        requests_call_args.extend(["**kwargs"])
+            requests_call_args.append(_JSON_CALL_ARG)
+        requests_call_args.append(_KWARGS)
         return requests_call_args
 
     def build_response_type(self, info: dict[str, Any]) -> str:
         if info["response_obj"]:
             if info["is_list"]:
-                return f"-> Optional[list[{info['response_obj']}]]"
+                return "-> Optional[list[{response_obj}]]"
             else:
-                return f"-> Optional[{info['response_obj']}]"
-        return "-> Any"
+                return "-> Optional[{response_obj}]"
+        return _RETURN_ANY
 
     def build_return_response(self, info: dict[str, Any]) -> str:
         raise NotImplementedError
 
-    def get_template(self, info: dict[str, Any]) -> Template:
+    def get_template(self, info: dict[str, Any]) -> str:
+        """
+        Return the :py:meth:`str.format` style template appropriate for the
+        shape of the method described by ``info``.
+
+        Args:
+            info: the function info dict
+
+        Returns:
+            A format string template for the method.
+        """
         raise NotImplementedError
 
+    def compose_template(self, info: dict[str, Any]) -> str:
+        """
+        Merge the signature, call args, response type and return statement
+        fragments into the method template for the shape of ``info``,
+        leaving only the per-method value placeholders to be formatted.
+
+        Args:
+            info: the function info dict
+
+        Returns:
+            The fully composed format string template for the method
+        """
+        template = self.get_template(info)
+        # str.replace rather than str.format here, so the placeholders and
+        # escaped braces inside the fragments survive until the final format.
+        template = template.replace(
+            "{function_params}", ", ".join(self.build_method_args(info))
+        )
+        template = template.replace("{response_type}", self.build_response_type(info))
+        template = template.replace("{return_response}", self.build_return_response(info))
+        template = template.replace(
+            "{call_params}", ", ".join(self.build_request_call_args(info))
+        )
+        return template
+
     def build(self, info: dict[str, Any]) -> str:
-        method_str = self.get_template(info)
-        return method_str.substitute(
+        shape = (
+            type(self),
+            bool(info["request_obj"]),
+            bool(info["path_parameters"]),
+            bool(info["query_parameters"]),
+            info["is_list"],
+            bool(info["response_obj"]),
+        )
+        template = self._shape_templates.get(shape)
+        if template is None:
+            template = self.compose_template(info)
+            self._shape_templates[shape] = template
+        return template.format(
             function_name=info["function_name"],
-            function_params=", ".join(self.build_method_args(info)),
-            response_type=self.build_response_type(info),
-            return_response=self.build_return_response(info),
             url=info["url"],
             method=info["method"],
-            call_params=", ".join(self.build_request_call_args(info)),
+            request_obj=info["request_obj"],
+            path_params=", ".join(info["path_parameters"]),
+            query_parameters=info["query_parameters"],
+            response_obj=info["response_obj"],
         )
 
 
 class AbstractManagerClassGenerator:
 
+    #: One class generator is built per tag, so pin the instance attributes
+    #: down with ``__slots__``: no per-instance ``__dict__``, and attribute
+    #: access becomes a fixed-offset load.
+    __slots__ = (
+        "tag",
+        "operations",
+        "schema_imports",
+        "schema_classes",
+        "_tag_prefix_re",
+        "_class_name",
+        "_method_builder",
+    )
+
     #: The class for the method builder we're using to build our
     #: manager methods Python code
     method_builder: Type[AbstractMethodBuilder]
 
-    def __init__(self, tag: str, paths: dict) -> None:
+    def __init__(self, tag: str, operations: list[tuple[str, str, dict[str, Any]]]) -> None:
         #: The OpenAPI tag of the endpoint we're generating the manager for
         self.tag = tag
-        #: the schema.yaml path structs
-        self.paths: dict = paths
+        #: The ``(url, method, method_def)`` tuples for the operations tagged
+        #: with our tag, pre-grouped by the caller so we don't have to filter
+        #: the full paths dict ourselves
+        self.operations: list[tuple[str, str, dict[str, Any]]] = operations
         #: A set of all the imports we need to reference the query parameter
         #: data classes in this class
         self.schema_imports: set = set()
@@ -100,13 +210,22 @@ class AbstractManagerClassGenerator:
         #: These will be added to the ``schemas.py`` file, and imported in the
         #: file this Manager will be generated in.
         self.schema_classes: list = []
+        #: The compiled pattern that strips our tag prefix from function
+        #: names, built once here instead of re-compiling per method
+        self._tag_prefix_re = re.compile(f"^{re.escape(tag)}_")
+        #: The name for the manager class, computed once here since it is
+        #: needed for every method we generate
+        self._class_name = tag.title().replace(" ", "").replace("_", "") + "Manager"
+        #: The method builder is stateless, so build it once here instead of
+        #: instantiating a fresh one per method
+        self._method_builder = self.method_builder()
 
     @property
     def class_name(self) -> str:
         """
         Return the name for the manager class.
         """
-        return self.tag.title().replace(" ", "").replace("_", "") + "Manager"
+        return self._class_name
 
     def get_function_name(self, method_def: dict[str, Any]) -> str:
         """
@@ -122,26 +241,36 @@ class AbstractManagerClassGenerator:
             A human friendly function name
         """
         function_name: str = operation_id_to_function_name(method_def["operationId"])
-        function_name = re.sub(f"^{self.tag}_", "", function_name).lower()
+        function_name = self._tag_prefix_re.sub("", function_name).lower()
         return function_name
 
     def get_method(
         self, url: str, method: str, method_def: dict[str, Any]
     ) -> str:
+        request_obj, request_refs = OpenAPIRequestObjectParser.parse(method_def)
+        response_info, response_refs = OpenAPIResponseObjectParser.parse(method_def)
+        # The parsers emit the component refs they discovered while walking
+        # the request body and responses, so we collect the schema imports
+        # here without a second traversal of the method definition.  Names
+        # that aren't real schema classes are dropped up front so nobody has
+        # to filter them out later.
+        self.schema_imports.update(
+            (request_refs | response_refs) - _EXCLUDED_IMPORTS
+        )
         info = {
             "url": url,
             "method": method,
             "function_name": self.get_function_name(method_def),
-            "path_parameters": set(),
+            "path_parameters": [],
             "query_parameters": "",
-            "request_obj": OpenAPIRequestObjectParser.parse(method_def),
-            "application_type": "application/json",
+            "request_obj": request_obj,
+            "application_type": APPLICATION_JSON,
             "response_obj": "",
             "is_list": False,
         }
-        info.update(OpenAPIResponseObjectParser.parse(method_def))
+        info.update(response_info)
         info.update(self.parse_parameters(url, method_def))
-        return self.method_builder().build(info)
+        return self._method_builder.build(info)
 
     def parse_parameters(
         self, url: str, method_def: dict[str, Any]
@@ -162,117 +291,65 @@ class AbstractManagerClassGenerator:
             return info
         return {}
 
-    def tag_name(self, method_def: dict[str, Any]) -> str:
-        """
-        Extract the raw tag name from ``method_def``.
-
-        Args:
-            method_def: the method definition to extract the tag from
-
-        Returns:
-            The raw tag name
-        """
-        return method_def["tags"][0].replace(" ", "")
-
-    def is_tag(self, method_def: dict[str, Any]) -> bool:
-        """
-        Return ``True`` if we should process this method definition.
-
-        Args:
-            method_def: the method definition to check
-
-        Returns:
-            ``True`` if ``method_def`` has the tag ``tag``
-        """
-        return self.tag_name(method_def) == self.tag
-
-    @property
-    def session_method(self) -> str:
-        raise NotImplementedError
+    #: The code for the ``session`` property of the generated manager class.
+    #: A plain class-level string constant, since it has nothing to
+    #: substitute; subclasses provide the client library specific body.
+    session_method: str
 
-    @property
-    def methods(self) -> list[str]:
+    def write_methods(self, buf: StringIO) -> None:
         """
-        Iterate through all the paths, and collect all (path, HTTP method) pairs
-        that have the ``tag`` in their ``tags`` key.  Build a Manager class that
-        collects all those paths as methods and associates with the schema.
+        Write the method code for each of our operations into ``buf``.  The
+        operations were pre-grouped by tag upstream, so every entry belongs
+        to this manager and we don't need to filter here.
 
         Args:
-            class_name: the name of the Manager class we're generating
-
-        Returns:
-            A list of module code strings
+            buf: the buffer to write the method code into
         """
-        methods: list[str] = []
-        methods.append(self.session_method)
-        for url, definition in self.paths.items():
-            # At this point, url is the path of the API endpoint we're
-            # interested in, and definition is the definition of that endpoint,
-            # which includes the HTTP method, the parameters, the request body,
-            for method, method_def in definition.items():
-                if self.is_tag(method_def):
-                    methods.append(self.get_method(url, method, method_def))
-        return methods
+        buf.write(self.session_method)
+        for url, method, method_def in self.operations:
+            buf.write("\n\n")
+            buf.write(self.get_method(url, method, method_def))
 
     def generate(self) -> str:
-        class_str = Template(
-            '''
-class $class_name:
-    """
-    This manager class is used to gather methods that call the API endpoints
-    that are associated with the ``$tag`` tag in the OpenAPI specification.
-
-    Args:
-        base_url: the base URL of the API
-
-    Keyword Args:
-        headers: any headers to send with the requests
-        proxies: any proxies to use when making the requests
-    """
-    #: The OpenAPI tag that this manager is associated with
-    openapi_tag: Final[str] = "$tag"
-
-    def __init__(
-        self,
-        base_url: str,
-        headers: Optional[dict[str, str]] = None,
-        proxies: Optional[dict[str, str]] = None,
-    ) -> None:
-        self.base_url = base_url
-        self.headers = headers
-        self.proxies = proxies
-
-$methods
-
-'''
-        )
-        cls = class_str.substitute(
-            class_name=self.class_name,
-            tag=self.tag,
-            methods="\n\n".join(self.methods),
-        )
-        return cls
+        buf = StringIO()
+        buf.write(_TPL_MANAGER_HEADER.format(class_name=self.class_name, tag=self.tag))
+        self.write_methods(buf)
+        buf.write("\n\n")
+        return buf.getvalue()
 
 
 class AbstractManagerFileGenerator:
 
+    #: One file generator is built per tag, so as with
+    #: :py:class:`AbstractManagerClassGenerator` we use ``__slots__`` to
+    #: skip the per-instance ``__dict__``.
+    __slots__ = ("__file_contents", "operations", "tag", "schema_definitions")
+
     #: The implementation specific class that generates the code for the Manager
     #: class
     manager_class_generator: Type[AbstractManagerClassGenerator]
 
-    def __init__(self, paths: dict, tag: str):
+    #: The import lines for things we're not generating.  These are built
+    #: once at class definition time and shared by every instance, so the
+    #: per-tag generation loop doesn't rebuild the list; subclasses extend
+    #: this with their client library import.
+    imports: tuple[str, ...] = ("from typing import Any, Final, Optional", "\n")
+
+    def __init__(self, operations: list[tuple[str, str, dict[str, Any]]], tag: str):
         """
-        Generate a python file that contains a Manager class for a the methods
-        in ``paths`` which are tagged with ``tag``.
+        Generate a python file that contains a Manager class for the methods
+        in ``operations``, which are the operations tagged with ``tag``.
 
         Args:
-            paths: path definitions from the OpenAPI specification
-            tag: The OpenAPI tag to use to filter methods
+            operations: the ``(url, method, method_def)`` tuples for the
+                operations tagged with ``tag``, pre-grouped from the OpenAPI
+                specification
+            tag: The OpenAPI tag these operations belong to
         """
         # The contents of the python file
         self.__file_contents: list[str] = []
-        #: The paths from the OpenAPI specification
-        self.paths: dict[str, Any] = paths
+        #: The pre-grouped operations for our tag
+        self.operations: list[tuple[str, str, dict[str, Any]]] = operations
         #: The OpenAPI tag that this manager is associated with.  This is used
         #: to identify methods in the OpenAPI specification that should be
         #: attached to this manager
@@ -284,69 +361,43 @@ class AbstractManagerFileGenerator:
         #: while parsing the OpenAPI specification for this manager
         self.schema_definitions: list[str] = []
 
-    @property
-    def imports(self) -> list[str]:
-        return ["from typing import Any, Final, Optional", "\n"]
-
-    def get_component_obj_name(self, data: dict) -> str | None:
-        if json_body := data["content"].get("application/json"):
-            if "items" in json_body["schema"]:
-                return json_body["schema"]["items"].get("$ref", "Any")
-            elif "$ref" in json_body["schema"]:
-                return json_body["schema"]["$ref"]
-        return None
-
-    @property
-    def schema_imports(self) -> set[str]:
-        schema_imports: set[str] = set()
-        for level_0 in self.paths.values():
-            for val in level_0.values():
-                tag_name = val["tags"][0].replace(" ", "")
-                if tag_name != self.tag:
-                    continue
-                if response := val.get("responses"):
-                    for resp_val in response.values():
-                        if "content" in resp_val:
-                            component_ref = self.get_component_obj_name(resp_val)
-                            if component_ref:
-                                schema_imports.add(component_ref.split("/")[-1])
-                if request_body := val.get("requestBody"):
-                    component_ref = self.get_component_obj_name(request_body)
-                    if component_ref:
-                        schema_imports.add(component_ref.split("/")[-1])
-        return schema_imports
-
     def generate(self, schema_path: str) -> None:
-        class_generator = self.manager_class_generator(self.tag, self.paths)
+        class_generator = self.manager_class_generator(self.tag, self.operations)
         # The body of our class
         cls = class_generator.generate()
-        # The imports for things we're not generating
-        self.__file_contents.extend(self.imports)
         # Add the Python code for the schema classes that were generated during
         # manager generation to our list of schema classes to hand upstream.  These
         # will be written to the schema.py file.
         self.schema_definitions.extend(class_generator.schema_classes)
-        # Our own imports
-        schema_imports = self.schema_imports.union(class_generator.schema_imports)
-        objs_str = ",\n".join(
-            [
-                obj
-                for obj in schema_imports
-                if obj not in ("AnyType", "Metaclass", "NoneType", "Any")
-            ]
-        )
+        # Our own imports.  The class generator collected the response and
+        # request body schema refs while generating the methods (with the
+        # non-schema names already excluded), so we just sort for stable
+        # output and join.
+        objs_str = ",\n".join(sorted(class_generator.schema_imports))
+        # Append the fragments in their final order, so we never have to
+        # prepend to (and thus copy) the contents list.
+        contents = self.__file_contents
+        if objs_str:
+            contents.append(f"from {schema_path} import ({objs_str})")
+            contents.append("\n")
+        contents.extend(self.imports)
         if objs_str:
-            data = [
-                f"from {schema_path} import ({objs_str})",
-                "\n",
-            ] + self.__file_contents
-            data.append("\n")
-            self.__file_contents = data
-        self.__file_contents.append(cls)
-
-    def write(self, folder_path: Path):
-        text = black.format_str("\n".join(self.__file_contents), mode=black.Mode())
-        #text = "\n".join(self.__file_contents)
-        file = folder_path / Path(f"{self.tag.lower()}.py")
-        file.write_text(text)
-        isort.api.sort_file(file)
+            contents.append("\n")
+        contents.append(cls)
+
+    def write(self, folder_path: Path) -> Path:
+        """
+        Write our file contents to ``folder_path``.  Formatting with black
+        and isort is left to the caller, which can do one pass over all the
+        generated files instead of paying the formatter startup cost per
+        file.
+
+        Args:
+            folder_path: the folder to write the manager file into
+
+        Returns:
+            The path of the file we wrote
+        """
+        file = folder_path / f"{self.tag.lower()}.py"
+        write_file(file, "\n".join(self.__file_contents))
+        return file
@@ -1,4 +1,3 @@
-from string import Template
 from typing import Any, Type
 
 from .abstract import (
@@ -7,84 +6,86 @@ from .abstract import (
     AbstractMethodBuilder
 )
 
-
-class MethodBuilder(AbstractMethodBuilder):
-
-    def get_template(self, info: dict[str, Any]) -> Template:
-        if info["query_parameters"] and not info["path_parameters"]:
-            function_str = Template(
-                """    async def $function_name(self, $function_params)$response_type:
+#: Method template for endpoints with query parameters but no path parameters.
+#: These are :py:meth:`str.format` style templates built once at import time;
+#: doubled braces (e.g. ``{{self.base_url}}``) are literal braces in the
+#: generated code.
+_TPL_QUERY_ONLY = """    async def {function_name}(self, {function_params}){response_type}:
 
         async with self.session as session:
-            async with session.$method(f"{self.base_url}$url", params=params.dict(exclude_unset=True), $call_params) as resp:
+            async with session.{method}(f"{{self.base_url}}{url}", params=params.dict(exclude_unset=True), {call_params}) as resp:
                 if resp.ok:
-                    $return_response
+                    {return_response}
                 else:
                     return None
 """
-            )
-        elif info["path_parameters"] and not info["query_parameters"]:
-            function_str = Template(
-                """    async def $function_name(self, $function_params)$response_type:
 
-        url = f"{self.base_url}$url"
+#: Method template for endpoints with path parameters but no query parameters.
+_TPL_PATH_ONLY = """    async def {function_name}(self, {function_params}){response_type}:
+
+        url = f"{{self.base_url}}{url}"
         async with self.session as session:
-            async with session.$method(url, $call_params) as resp:
+            async with session.{method}(url, {call_params}) as resp:
                 if resp.ok:
-                    $return_response
+                    {return_response}
                 else:
                     return None
 """
-            )
-        elif info["path_parameters"] and info["query_parameters"]:
-            function_str = Template(
-                """    async def $function_name(self, $function_params)$response_type:
 
-        url = f"{self.base_url}$url"
+#: Method template for endpoints with both path and query parameters.
+_TPL_BOTH = """    async def {function_name}(self, {function_params}){response_type}:
+
+        url = f"{{self.base_url}}{url}"
         async with self.session as session:
-            async with session.$method(url, params=params.dict(exclude_unset=True), $call_params) as resp:
+            async with session.{method}(url, params=params.dict(exclude_unset=True), {call_params}) as resp:
                 if resp.ok:
-                    $return_response
+                    {return_response}
                 else:
                     return None
 """
-            )
-        else:
-            function_str = Template(
-                """    async def $function_name(self, $function_params)$response_type:
+
+#: Method template for endpoints with neither path nor query parameters.
+_TPL_NEITHER = """    async def {function_name}(self, {function_params}){response_type}:
 
         async with self.session as session:
-            async with session.$method(f"{self.base_url}$url", $call_params) as resp:
+            async with session.{method}(f"{{self.base_url}}{url}", {call_params}) as resp:
                 if resp.ok:
-                    $return_response
+                    {return_response}
                 else:
                     return None
 """
-            )
-        return function_str
+
+
+#: The method templates indexed by ``(has_path_params << 1) | has_query_params``.
+_TEMPLATES = (_TPL_NEITHER, _TPL_QUERY_ONLY, _TPL_PATH_ONLY, _TPL_BOTH)
+
+
+class MethodBuilder(AbstractMethodBuilder):
+
+    __slots__ = ()
+
+    def get_template(self, info: dict[str, Any]) -> str:
+        index = (bool(info["path_parameters"]) << 1) | bool(info["query_parameters"])
+        return _TEMPLATES[index]
 
     def build_return_response(self, info: dict[str, Any]) -> str:
         if info["response_obj"]:
             if info["is_list"]:
-                return Template(
-                    """data = await resp.json()
-                    return [$resp_obj(**obj) for obj in data]"""
-                ).substitute(resp_obj=info["response_obj"])
+                return """data = await resp.json()
+                    return [{response_obj}(**obj) for obj in data]"""
             else:
-                return Template(
-                    """data = await resp.json()
-                    return $resp_obj(**data)"""
-                ).substitute(resp_obj=info["response_obj"])
-        return Template("""return await resp.json()""").substitute()
+                return """data = await resp.json()
+                    return {response_obj}(**data)"""
+        return "return await resp.json()"
 
 
 class ManagerClassGenerator(AbstractManagerClassGenerator):
 
+    __slots__ = ()
+
     method_builder: Type[AbstractMethodBuilder] = MethodBuilder
 
-    @property
-    def session_method(self) -> str:
-        return Template('''
+    session_method: str = '''
     @property
     def session(self) -> aiohttp.ClientSession:
         """
@@ -96,15 +97,13 @@ class ManagerClassGenerator(AbstractManagerClassGenerator):
             A configured :py:class:`aiohttp.ClientSession` object
         """
         return aiohttp.ClientSession(headers=self.headers)
-        ''').substitute()
+        '''
 
 
 class ManagerFileGenerator(AbstractManagerFileGenerator):
 
+    __slots__ = ()
+
     manager_class_generator: Type[AbstractManagerClassGenerator] = ManagerClassGenerator
 
-    @property
-    def imports(self) -> list[str]:
-        _imports = super().imports
-        _imports.append("import aiohttp")
-        return _imports
+    imports: tuple[str, ...] = AbstractManagerFileGenerator.imports + ("import aiohttp",)
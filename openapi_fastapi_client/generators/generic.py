@@ -1,7 +1,18 @@
-from string import Template
 from typing import Optional, Any
 
-from openapi_fastapi_client.helpers import TYPE_CONVERTION, operation_id_to_function_name
+from openapi_fastapi_client.helpers import (
+    APPLICATION_JSON,
+    TYPE_CONVERTION,
+    operation_id_to_function_name,
+)
+
+#: The :py:meth:`str.format` style template for a query parameter pydantic
+#: class definition.
+_TPL_QUERY_PARAM_CLASS = '''class {cls_name}(BaseModel):
+        """
+        {description}
+        """
+        {params}'''
 
 
 class OpenAPIParameterParser:
@@ -10,7 +21,7 @@ class OpenAPIParameterParser:
     and :py:class:`pydantic.BaseModel` definitions.
     """
 
-    def parse_path_parameter(self, url: str, parameter: dict[str, Any]) -> tuple:
+    def parse_path_parameter(self, url: str, parameter: dict[str, Any]) -> tuple[str, str]:
         # Make a python compatible name for the parameter.
         name = operation_id_to_function_name(parameter["name"])
         ptype = parameter["schema"]["type"]
@@ -25,87 +36,143 @@ class OpenAPIParameterParser:
             param_str: str = f"{parameter['name']}: {TYPE_CONVERTION[parameter['schema']['type']]}"
         else:
             param_str = f"{parameter['name']}: Optional[{TYPE_CONVERTION[parameter['schema']['type']]}] = None"
-        return Template(
-            """#: $description
-        $param_str"""
-        ).substitute(
-            description=parameter.get("description", "The parameter description is missing"),
-            param_str=param_str,
-        )
-
-    def parse(self, url: str, method_def: dict[str, Any]) -> tuple:
-        path_parameters = set()
-        query_parameters = set()
+        description = parameter.get("description", "The parameter description is missing")
+        return f"""#: {description}
+        {param_str}"""
+
+    def parse(
+        self, url: str, method_def: dict[str, Any]
+    ) -> tuple[str, list[str], list[str]]:
+        # Collect the parameters as ordered lists with explicit seen-sets for
+        # dedup, rather than sets, so the generated code has a deterministic
+        # parameter order.
+        path_parameters: list[str] = []
+        seen_path: set[str] = set()
+        query_params: list[dict[str, Any]] = []
+        seen_query: set[str] = set()
         if parameters := method_def.get("parameters"):
             for parameter in parameters:
                 if parameter["in"] == "path":
                     url, param_def = self.parse_path_parameter(url, parameter)
-                    path_parameters.add(param_def)
+                    if param_def not in seen_path:
+                        seen_path.add(param_def)
+                        path_parameters.append(param_def)
                 elif parameter["in"] == "query":
-                    query_parameters.add(self.parse_query_parameter(parameter))
+                    if parameter["name"] not in seen_query:
+                        seen_query.add(parameter["name"])
+                        query_params.append(parameter)
+        # Required parameters first, then by name, so the generated query
+        # param classes are stable across runs.
+        query_params.sort(key=lambda param: (not param.get("required"), param["name"]))
+        query_parameters = [self.parse_query_parameter(param) for param in query_params]
         return url, path_parameters, query_parameters
 
 
 class OpenAPIRequestObjectParser:
+
     @staticmethod
-    def parse(method_def: dict[str, Any]) -> str:
+    def parse(method_def: dict[str, Any]) -> tuple[str, set[str]]:
         """
-        Parse the request object definition from ``method_def``.
+        Parse the request object definition from ``method_def``.  Each method
+        definition is parsed exactly once per generation, so there is nothing
+        to cache here.
 
         Args:
             method_def: the method definition we're parsing
 
         Returns:
-            The request object definition
+            A two-tuple of the request object definition and the schema
+            component names it references
         """
+        refs: set[str] = set()
         if request_body := method_def.get("requestBody"):
-            if json_data := request_body["content"].get("application/json"):
-                if "items" in json_data["schema"]:
-                    obj_name = json_data["schema"]["items"]["$ref"].split("/")[-1]
-                    return f"list[{obj_name}]"
+            if json_data := request_body["content"].get(APPLICATION_JSON):
+                schema = json_data["schema"]
+                if items := schema.get("items"):
+                    obj_name = items["$ref"].rsplit("/", 1)[-1]
+                    refs.add(obj_name)
+                    return f"list[{obj_name}]", refs
                 else:
-                    return json_data["schema"].get("$ref", "Any").split("/")[-1]
-        return ""
+                    obj_name = schema.get("$ref", "Any").rsplit("/", 1)[-1]
+                    refs.add(obj_name)
+                    return obj_name, refs
+        return "", refs
 
 
 class OpenAPIResponseObjectParser:
+
     @staticmethod
-    def parse(method_def: dict[str, Any]) -> dict[str, Any]:
+    def parse(method_def: dict[str, Any]) -> tuple[dict[str, Any], set[str]]:
+        """
+        Parse the response object definition from ``method_def``.  As with
+        :py:class:`OpenAPIRequestObjectParser`, each method definition is
+        parsed exactly once per generation, so the result is not cached.
+
+        Args:
+            method_def: the method definition we're parsing
+
+        Returns:
+            A two-tuple of a dict with the ``response_obj`` and ``is_list``
+            keys, and the schema component names the responses reference
+        """
         response_obj: Optional[str] = ""
         is_list: bool = False
+        refs: set[str] = set()
+        #: The ``(response_name, is_list)`` candidates in preference order:
+        #: first 2xx response, then the ``default`` response, then the last
+        #: response with a schema.  Plenty of real specs document only a
+        #: ``default`` response, so we can't require a 2xx.
+        success: Optional[tuple[str, bool]] = None
+        default: Optional[tuple[str, bool]] = None
+        last: Optional[tuple[str, bool]] = None
         if responses := method_def.get("responses"):
-            for content in responses.values():
-                if resp_content := content.get("content"):
-                    if "items" in resp_content["application/json"]["schema"]:
-                        response_ref = resp_content["application/json"]["schema"]["items"].get(
-                            "$ref", "Any"
-                        )
-                        is_list = True
-                    elif "$ref" in resp_content["application/json"]["schema"]:
-                        response_ref = resp_content["application/json"]["schema"]["$ref"]
-                    elif (
-                        "additionalProperties" in resp_content["application/json"]["schema"]
-                        and "type"
-                        in resp_content["application/json"]["schema"]["additionalProperties"]
-                    ):
-                        response_ref = TYPE_CONVERTION[
-                            resp_content["application/json"]["schema"]["additionalProperties"][
-                                "type"
-                            ]
-                        ]
-                    else:
-                        try:
-                            response_ref = TYPE_CONVERTION[
-                                resp_content["application/json"]["schema"]["type"]
-                            ]
-                        except KeyError:
-                            continue
-
-                    if response_ref.split("/")[-1] in ("NoneType", "Metaclass"):
-                        response_obj = None
-                    else:
-                        response_obj = response_ref.split("/")[-1]
-        return {"response_obj": response_obj, "is_list": is_list}
+            for status, content in responses.items():
+                resp_content = content.get("content")
+                if not resp_content:
+                    continue
+                schema = resp_content.get(APPLICATION_JSON, {}).get("schema")
+                if not schema:
+                    continue
+                # Bind the nested lookups once and branch on the locals.
+                items = schema.get("items")
+                ref = schema.get("$ref")
+                additional = schema.get("additionalProperties")
+                if items is not None:
+                    response_ref = items.get("$ref", "Any")
+                    ref_is_list = True
+                elif ref is not None:
+                    response_ref = ref
+                    ref_is_list = False
+                elif additional is not None and "type" in additional:
+                    response_ref = TYPE_CONVERTION[additional["type"]]
+                    ref_is_list = False
+                else:
+                    try:
+                        response_ref = TYPE_CONVERTION[schema["type"]]
+                    except KeyError:
+                        continue
+                    ref_is_list = False
+
+                response_name = response_ref.rsplit("/", 1)[-1]
+                # Only actual component refs (and list items) are schema
+                # imports; the TYPE_CONVERTION branches produce builtin types.
+                if items is not None or ref is not None:
+                    refs.add(response_name)
+                candidate = (response_name, ref_is_list)
+                status = str(status)
+                if success is None and status.startswith("2"):
+                    success = candidate
+                elif status == "default":
+                    default = candidate
+                last = candidate
+        chosen = success or default or last
+        if chosen:
+            response_name, is_list = chosen
+            if response_name in ("NoneType", "Metaclass"):
+                response_obj = None
+            else:
+                response_obj = response_name
+        return {"response_obj": response_obj, "is_list": is_list}, refs
 
 
 class QueryParamTypedictGenerator:
@@ -128,7 +195,7 @@ class QueryParamTypedictGenerator:
 
     @staticmethod
     def generate(
-        tag: str, manager_class_name: str, func_name: str, params: set[str]
+        tag: str, manager_class_name: str, func_name: str, params: list[str]
     ) -> tuple[str, str]:
         # Make a python compatible name for the tag.
         tag_name = tag.title().replace("_", "").replace(" ", "") + "Query"
@@ -138,11 +205,7 @@ class QueryParamTypedictGenerator:
             "A model that holds all the query parameters for the "
             f":py:meth:`{manager_class_name}.{func_name}` method."
         )
-        request_str = Template(
-            '''class $cls_name(BaseModel):
-        """
-        $description
-        """
-        $params'''
-        ).substitute(cls_name=cls_name, description=description, params="\n\t".join(params))
+        request_str = _TPL_QUERY_PARAM_CLASS.format(
+            cls_name=cls_name, description=description, params="\n\t".join(params)
+        )
         return request_str, cls_name
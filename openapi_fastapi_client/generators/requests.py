@@ -1,4 +1,3 @@
-from string import Template
 from typing import Any, Type
 
 from .abstract import (
@@ -7,86 +6,92 @@ from .abstract import (
     AbstractMethodBuilder
 )
 
-
-class MethodBuilder(AbstractMethodBuilder):
-
-    def get_template(self, info: dict[str, Any]) -> Template:
-        if info["query_parameters"] and not info["path_parameters"]:
-            function_str = Template(
-                """    def $function_name(self, $function_params)$response_type:
+#: Method template for endpoints with query parameters but no path parameters.
+#: These are :py:meth:`str.format` style templates built once at import time;
+#: doubled braces (e.g. ``{{self.base_url}}``) are literal braces in the
+#: generated code.
+_TPL_QUERY_ONLY = """    def {function_name}(self, {function_params}){response_type}:
 
         with self.session as session:
-            response_obj = session.$method(url=f"{self.base_url}$url", params=params.dict(exclude_unset=True), $call_params)
+            response_obj = session.{method}(url=f"{{self.base_url}}{url}", params=params.dict(exclude_unset=True), {call_params})
 
         if response_obj.ok:
-            return $return_response
+            return {return_response}
         return None
 """
-            )
-        elif info["path_parameters"] and not info["query_parameters"]:
-            function_str = Template(
-                """    def $function_name(self, $function_params)$response_type:
-        url = f"{self.base_url}$url"
+
+#: Method template for endpoints with path parameters but no query parameters.
+_TPL_PATH_ONLY = """    def {function_name}(self, {function_params}){response_type}:
+        url = f"{{self.base_url}}{url}"
 
         with self.session as session:
-            response_obj = session.$method(url=url, $call_params)
+            response_obj = session.{method}(url=url, {call_params})
 
         if response_obj.ok:
-            return $return_response
+            return {return_response}
         return None
 """
-            )
-        elif info["path_parameters"] and info["query_parameters"]:
-            function_str = Template(
-                """    def $function_name(self, $function_params)$response_type:
-        url = f"{self.base_url}$url"
+
+#: Method template for endpoints with both path and query parameters.
+_TPL_BOTH = """    def {function_name}(self, {function_params}){response_type}:
+        url = f"{{self.base_url}}{url}"
 
         with self.session as session:
-            response_obj = session.$method(url=url, params=params.dict(exclude_unset=True), $call_params)
+            response_obj = session.{method}(url=url, params=params.dict(exclude_unset=True), {call_params})
 
         if response_obj.ok:
-            return $return_response
+            return {return_response}
         return None
 """
-            )
-        else:
-            function_str = Template(
-                """    def $function_name(self, $function_params)$response_type:
+
+#: Method template for endpoints with neither path nor query parameters.
+_TPL_NEITHER = """    def {function_name}(self, {function_params}){response_type}:
 
         with self.session as session:
-            response_obj = session.$method(url=f"{self.base_url}$url", $call_params)
+            response_obj = session.{method}(url=f"{{self.base_url}}{url}", {call_params})
 
         if response_obj.ok:
-            return $return_response
+            return {return_response}
         return None
 """
-            )
-        return function_str
+
+
+#: The method templates indexed by ``(has_path_params << 1) | has_query_params``.
+_TEMPLATES = (_TPL_NEITHER, _TPL_QUERY_ONLY, _TPL_PATH_ONLY, _TPL_BOTH)
+
+
+class MethodBuilder(AbstractMethodBuilder):
+
+    __slots__ = ()
+
+    def get_template(self, info: dict[str, Any]) -> str:
+        index = (bool(info["path_parameters"]) << 1) | bool(info["query_parameters"])
+        return _TEMPLATES[index]
 
     def build_response_type(self, info: dict[str, Any]) -> str:
         if info["response_obj"]:
             if info["is_list"]:
-                return f"-> Optional[list[{info['response_obj']}]]"
+                return "-> Optional[list[{response_obj}]]"
             else:
-                return f"-> Optional[{info['response_obj']}]"
+                return "-> Optional[{response_obj}]"
         return "-> Any"
 
     def build_return_response(self, info: dict[str, Any]) -> str:
         if info["response_obj"]:
             if info["is_list"]:
-                return f"[{info['response_obj']}(**obj) for obj in response_obj.json()]"
+                return "[{response_obj}(**obj) for obj in response_obj.json()]"
             else:
-                return f"{info['response_obj']}(**response_obj.json())"
+                return "{response_obj}(**response_obj.json())"
         return "response_obj.json()"
 
 
 class ManagerClassGenerator(AbstractManagerClassGenerator):
 
+    __slots__ = ()
+
     method_builder: Type[AbstractMethodBuilder] = MethodBuilder
 
-    @property
-    def session_method(self) -> str:
-        return Template('''
+    session_method: str = '''
     @property
     def session(self) -> requests.Session:
         """
@@ -101,15 +106,13 @@ class ManagerClassGenerator(AbstractManagerClassGenerator):
         s.headers.update(self.headers or {})
         s.proxies.update(self.proxies or {})
         return s
-        ''').substitute()
+        '''
 
 
 class ManagerFileGenerator(AbstractManagerFileGenerator):
 
+    __slots__ = ()
+
     manager_class_generator: Type[AbstractManagerClassGenerator] = ManagerClassGenerator
 
-    @property
-    def imports(self) -> list[str]:
-        _imports = super().imports
-        _imports.append("import requests")
-        return _imports
+    imports: tuple[str, ...] = AbstractManagerFileGenerator.imports + ("import requests",)
@@ -1,4 +1,6 @@
+import os
 import re
+from pathlib import Path
 from string import Template
 
 
@@ -12,8 +14,8 @@ def operation_id_to_function_name(operation_id: str) -> str:
     return operation_id_to_function_name("".join(chars))
 
 
-def function_like_name_to_class_name(val: str, /):
-    def to_title(val_: str):
+def function_like_name_to_class_name(val: str, /) -> str:
+    def to_title(val_: str) -> str:
         if val_[0].isupper():
             return val_
         else:
@@ -22,6 +24,29 @@ def function_like_name_to_class_name(val: str, /):
     return "".join([to_title(obj) for obj in val.split("_")])
 
 
+def write_file(path: Path, text: str) -> None:
+    """
+    Write ``text`` to ``path`` as UTF-8 through a raw file descriptor.
+    All our generated files are written whole, so a single
+    :py:func:`os.write` on an ``O_WRONLY|O_CREAT|O_TRUNC`` fd skips the
+    buffered IO machinery that a ``path.open("w")`` write would set up
+    per file.
+
+    Args:
+        path: the file to write
+        text: the full contents of the file
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, text.encode("utf-8"))
+    finally:
+        os.close(fd)
+
+
+#: The content type we generate request and response handling for.  Shared
+#: so the hot parser paths hash one interned string for their dict lookups.
+APPLICATION_JSON = "application/json"
+
 TYPE_CONVERTION = {
     "integer": "int",
     "number": "float",
@@ -68,7 +93,7 @@ def number_constraints(type_info: dict) -> str:
     return ""
 
 
-def create_validator(field_name: str, field_type: str):
+def create_validator(field_name: str, field_type: str) -> str:
     function_name = f"optional_{field_name}"
     return Template(
         """
@@ -2,7 +2,6 @@ from pathlib import Path
 from typing import Optional
 
 import typer
-import yaml
 
 from .project import ProjectGenerator
 
@@ -17,17 +16,22 @@ def main(
     async_req: Optional[bool] = typer.Option(
         False, "--async", help="All requests to the client are asynchronous with aiohttp."
     ),
+    no_format: Optional[bool] = typer.Option(
+        False, "--no-format", help="Skip formatting the generated files with black and isort."
+    ),
+    tag_filter: Optional[str] = typer.Option(
+        None, "--tag-filter", help="Only generate managers for tags matching this regex."
+    ),
 ):
     if not openapi_file.exists():
         raise FileNotFoundError(f"{openapi_file} does not exists.")
 
-    with openapi_file.open("r") as yaml_file:
-        openapi_schema = yaml.load(yaml_file, Loader=yaml.CFullLoader)
-
-    project = ProjectGenerator(
+    project = ProjectGenerator.from_spec_file(
+        openapi_file,
         destination,
         module_name,
-        openapi_schema,
         "aiohttp" if async_req else "requests",
+        format_code=not no_format,
+        tag_filter=tag_filter,
     )
     project.generate()
@@ -1,10 +1,63 @@
+import hashlib
+import multiprocessing
+import os
+import pickle
+import re
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Type, Literal
+from typing import Any, Optional, Type, Literal
 
+import black
+import isort
+import yaml
+
+from .helpers import write_file
 from .schema import Schema
 from .generators import requests, aiohttp
 from .generators.abstract import AbstractManagerFileGenerator
 
+#: The black configuration for formatting generated files, built once per
+#: process and shared across ProjectGenerator runs.  Pinning the target
+#: version skips black's per-file syntax-based target detection; the
+#: generated code requires Python 3.10+ anyway (see pyproject.toml).
+_BLACK_MODE = black.Mode(target_versions={black.TargetVersion.PY310})
+
+#: Translation table that strips whitespace from tags, built once so tag
+#: normalization is a single C-level translate per operation.
+_STRIP_SPACES = str.maketrans("", "", " \t\n")
+
+
+def _generate_manager(
+    generator_class: Type[AbstractManagerFileGenerator],
+    operations: list[tuple[str, str, dict[str, Any]]],
+    tag: str,
+    schema_path: str,
+    folder_path: Path,
+) -> tuple[list[str], Path]:
+    """
+    Generate and write one manager file.  This is a module level function so
+    that :py:meth:`ProjectGenerator.generate_managers` can run it in worker
+    processes.
+
+    Args:
+        generator_class: the manager file generator class to use
+        operations: the pre-grouped operations for ``tag``
+        tag: the OpenAPI tag the manager is for
+        schema_path: the dotted module path the manager imports schemas from
+        folder_path: the folder to write the manager file into
+
+    Returns:
+        A two-tuple of the schema class definitions discovered while
+        generating the manager, and the path of the file written
+    """
+    manager_file = generator_class(operations, tag=tag)
+    manager_file.generate(schema_path=schema_path)
+    file = manager_file.write(folder_path)
+    return manager_file.schema_definitions, file
+
 
 class ProjectGenerator:
     """
@@ -15,12 +68,13 @@ class ProjectGenerator:
     Args:
         module_name: what to name the Python module
         openapi_schema: the contents of our OpenAPI schema file as a python dict
-    """
 
-    generators: dict[str, Type[AbstractManagerFileGenerator]] = {
-        'requests': requests.ManagerFileGenerator,
-        'aiohttp': aiohttp.ManagerFileGenerator,
-    }
+    Keyword Args:
+        format_code: if ``True``, run black and isort over the generated
+            files after generation
+        tag_filter: if set, only generate managers for tags matching this
+            regular expression
+    """
 
     def __init__(
         self,
@@ -28,69 +82,212 @@ class ProjectGenerator:
         module_name: str,
         openapi_schema: dict[str, Any],
         client_type: Literal["requests", "aiohttp"] = 'requests',
+        format_code: bool = True,
+        tag_filter: Optional[str] = None,
     ) -> None:
         self.module_name = module_name
         self.destination = destination
-        self.module_path = destination / Path(module_name)
-        self.managers_path = self.module_path / Path("managers")
-        self.models_path = self.module_path / Path("models.py")
+        self.module_path = destination / module_name
+        self.managers_path = self.module_path / "managers"
+        self.models_path = self.module_path / "models.py"
         self.openapi_schema = openapi_schema
         self.client_type = client_type
+        #: The manager file generator class for the client type, bound once
+        #: here so generate_managers calls the constructor directly instead
+        #: of going through a property and a dict lookup per tag.
+        self._manager_cls: Type[AbstractManagerFileGenerator] = (
+            requests.ManagerFileGenerator
+            if client_type == "requests"
+            else aiohttp.ManagerFileGenerator
+        )
+        self.format_code = format_code
+        self.tag_filter = re.compile(tag_filter) if tag_filter else None
+
+        #: The schema class definitions discovered while generating the
+        #: managers.  A dict used as an ordered set: the same query param
+        #: class can surface from several managers, and deduping here keeps
+        #: Schema.generate() from rendering it more than once.
+        self.schema_definitions: dict[str, None] = {}
+        #: The python files we've generated, collected so we can format them
+        #: all in one pass at the end of generation
+        self.generated_files: list[Path] = []
+
+    @classmethod
+    def from_spec_file(
+        cls,
+        openapi_file: Path,
+        destination: Path,
+        module_name: str,
+        client_type: Literal["requests", "aiohttp"] = "requests",
+        format_code: bool = True,
+        tag_filter: Optional[str] = None,
+        cache_dir: Optional[Path] = None,
+    ) -> "ProjectGenerator":
+        """
+        Build a :py:class:`ProjectGenerator` from an OpenAPI YAML file,
+        caching the parsed spec as a pickle so repeated runs skip the YAML
+        parse entirely.  The cache carries the source file's mtime, size and
+        content hash: an mtime+size match accepts the cache without even
+        reading the YAML, and a touched-but-unchanged file is still accepted
+        via the hash.  Caching is best effort: an unreadable, unusable or
+        unwritable cache just means we parse the YAML.
 
-        self.schema_definitions: list[str] = []
+        Args:
+            openapi_file: the path to the OpenAPI YAML file
+            destination: where to generate the client project
+            module_name: what to name the Python module
 
-    @property
+        Keyword Args:
+            client_type: which client library the generated code uses
+            format_code: if ``True``, run black and isort over the generated
+                files after generation
+            tag_filter: if set, only generate managers for tags matching
+                this regular expression
+            cache_dir: where to keep the spec cache; defaults to a
+                directory of ours under the system temp directory
+
+        Returns:
+            A configured :py:class:`ProjectGenerator`
+        """
+        # The cache lives in our own directory under the system temp dir by
+        # default, never next to the user's spec: pickle.load is code
+        # execution, so we won't pick up a sidecar that shipped alongside a
+        # downloaded spec, and we don't litter the spec's directory with
+        # artifacts.  The filename carries a hash of the spec's absolute
+        # path so same-named specs don't collide.
+        if cache_dir is None:
+            cache_dir = Path(tempfile.gettempdir()) / "openapi-fastapi-client"
+        path_digest = hashlib.blake2b(
+            str(openapi_file.resolve()).encode("utf-8"), digest_size=8
+        ).hexdigest()
+        cache_file = cache_dir / f"{openapi_file.stem}-{path_digest}.spec.pkl"
+        stat = openapi_file.stat()
+        raw: Optional[bytes] = None
+        openapi_schema: Optional[dict[str, Any]] = None
+        if cache_file.exists():
+            # Any unusable cache -- truncated, not our (header, schema)
+            # tuple, or a header missing keys -- just means we fall through
+            # to the YAML parse and rewrite it, so catch everything here.
+            try:
+                with cache_file.open("rb") as fd:
+                    header, cached_schema = pickle.load(fd)
+                if header["mtime"] == stat.st_mtime and header["size"] == stat.st_size:
+                    openapi_schema = cached_schema
+                else:
+                    raw = openapi_file.read_bytes()
+                    if header["blake2b"] == hashlib.blake2b(raw).hexdigest():
+                        openapi_schema = cached_schema
+            except Exception:
+                openapi_schema = None
+        if openapi_schema is None:
+            if raw is None:
+                raw = openapi_file.read_bytes()
+            openapi_schema = yaml.load(raw, Loader=yaml.CFullLoader)
+            header = {
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+                "blake2b": hashlib.blake2b(raw).hexdigest(),
+            }
+            # Best effort: a read-only cache location must not kill the run.
+            try:
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                with cache_file.open("wb") as fd:
+                    pickle.dump(
+                        (header, openapi_schema), fd, protocol=pickle.HIGHEST_PROTOCOL
+                    )
+            except OSError:
+                pass
+        return cls(
+            destination,
+            module_name,
+            openapi_schema,
+            client_type,
+            format_code=format_code,
+            tag_filter=tag_filter,
+        )
+
+    @cached_property
     def openapi_tags(self) -> list[str]:
         """
         Return the all unique tags from all paths in the OpenAPI schema.
+        Computed once per instance, since the spec doesn't change under us.
 
         Returns:
             A list of unique tags from all paths in the OpenAPI schema
         """
-        return list(set(
-            [
-                val_obj["tags"][0].replace(" ", "")
-                for url, val in self.paths.items()
-                for key, val_obj in val.items()
-            ]
-        ))
+        # A set comprehension over .values() dedupes as it goes, with no
+        # intermediate list and no unpacking of keys we'd only discard.
+        # Operations without tags are legal OpenAPI, so guard with .get().
+        # Tags recur heavily across operations, so interning the normalized
+        # names lets the set dedupe on pointer identity.
+        return list(
+            {
+                sys.intern(method_def["tags"][0].translate(_STRIP_SPACES))
+                for definition in self.paths.values()
+                for method_def in definition.values()
+                if method_def.get("tags")
+            }
+        )
+
+    @cached_property
+    def tag_operations(self) -> dict[str, list[tuple[str, str, dict[str, Any]]]]:
+        """
+        Group the operations in the OpenAPI schema by tag in a single pass
+        over the paths, so that each manager generator gets only the
+        operations it cares about instead of re-filtering the full paths
+        dict itself.  Built once per instance.
+
+        Returns:
+            A mapping of tag to the list of ``(url, method, method_def)``
+            tuples tagged with it
+        """
+        tag_to_ops: dict[str, list[tuple[str, str, dict[str, Any]]]] = {}
+        for url, definition in self.paths.items():
+            for method, method_def in definition.items():
+                # Operations without tags are legal OpenAPI; there's no
+                # manager to attach them to, so skip them.
+                tags = method_def.get("tags")
+                if not tags:
+                    continue
+                tag = sys.intern(tags[0].translate(_STRIP_SPACES))
+                if self.tag_filter and not self.tag_filter.search(tag):
+                    continue
+                tag_to_ops.setdefault(tag, []).append((url, method, method_def))
+        return tag_to_ops
 
-    @property
+    @cached_property
     def paths(self) -> dict[str, Any]:
         """
-        Return the paths object from the OpenAPI schema.
+        Return the paths object from the OpenAPI schema.  Resolved once per
+        instance; every later access is an instance dict lookup.
 
         Returns:
             The paths object from the OpenAPI schema
         """
         return self.openapi_schema["paths"]
 
-    @property
+    @cached_property
     def schemas(self) -> dict[str, Any]:
         """
-        Return the schemas object from the OpenAPI schema.
+        Return the schemas object from the OpenAPI schema.  Resolved once
+        per instance, like :py:attr:`paths`.
 
         Returns:
             The schemas object from the OpenAPI schema
         """
         return self.openapi_schema["components"]["schemas"]
 
-    @property
-    def manager_generator_class(self) -> Type[AbstractManagerFileGenerator]:
-        """
-        Return the manager generator class for the client type.
-
-        Returns:
-            The manager generator class for the client type
-        """
-        return self.generators[self.client_type]
-
     def make_python_module(self, path: Path) -> None:
-        if not path.exists():
-            path.mkdir(parents=True, exist_ok=True)
-            init_py = path / Path("__init__.py")
-            with init_py.open("w") as file:
-                file.write("\n")
+        # exist_ok=True already handles the directory existing (or racing
+        # into existence), so there's no point paying for a separate
+        # exists() stat first.  Checking __init__.py on its own also means
+        # a hand-deleted init file gets recreated on the next run.
+        path.mkdir(parents=True, exist_ok=True)
+        init_py = path / "__init__.py"
+        if not init_py.exists():
+            # An empty __init__.py is all we need; touch() skips the whole
+            # buffered-write machinery for a one-byte file.
+            init_py.touch()
 
     def generate_module(self) -> None:
         """
@@ -101,36 +298,108 @@ class ProjectGenerator:
 
     def generate_managers(self) -> None:
         """
-        Generate all our manager files.
+        Generate all our manager files.  Each tag produces an independent
+        file from the shared, immutable spec, so with more than one tag we
+        farm the generation out to a process pool and collect the results in
+        submission order to keep the output deterministic.
+        """
+        tag_operations = self.tag_operations
+        if len(tag_operations) > 1:
+            # No point spawning more workers than we have tags to render.
+            max_workers = min(len(tag_operations), os.cpu_count() or 1)
+            # We're called from a ThreadPoolExecutor worker while the schema
+            # thread is running, so the workers must be spawned, not forked:
+            # forking a multithreaded process is a documented deadlock
+            # hazard (and a DeprecationWarning on 3.12+).
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        _generate_manager,
+                        self._manager_cls,
+                        operations,
+                        tag,
+                        "..models",
+                        self.managers_path,
+                    )
+                    for tag, operations in tag_operations.items()
+                ]
+                for future in futures:
+                    schema_definitions, file = future.result()
+                    self.schema_definitions.update(dict.fromkeys(schema_definitions))
+                    self.generated_files.append(file)
+        else:
+            for tag, operations in tag_operations.items():
+                schema_definitions, file = _generate_manager(
+                    self._manager_cls,
+                    operations,
+                    tag,
+                    "..models",
+                    self.managers_path,
+                )
+                self.schema_definitions.update(dict.fromkeys(schema_definitions))
+                self.generated_files.append(file)
+
+    def build_schema(self) -> Schema:
+        """
+        Build and render the schema classes from the components section of
+        the OpenAPI specification.  This only reads the spec, so it can run
+        concurrently with :py:meth:`generate_managers`.
+
+        Returns:
+            The rendered :py:class:`Schema`
         """
-        for tag in self.openapi_tags:
-            manager_file = self.manager_generator_class(self.paths, tag=tag)
-            manager_file.generate(schema_path="..models")  # type: ignore
-            self.schema_definitions.extend(manager_file.schema_definitions)
-            manager_file.write(self.managers_path)
+        schema = Schema(self.schemas)
+        schema.generate()
+        return schema
 
-    def generate_models(self) -> None:
+    def generate_models(self, schema: Schema) -> None:
         """
-        Generate our ``models.py`` file
+        Write our ``models.py`` file from the rendered ``schema``.
 
         .. note::
 
             This needs to come after generating the managers with
             :py:meth:`generate_managers`, because in building the managers
             we will discover more schemas that need to be included.
+
+        Args:
+            schema: the rendered schema from :py:meth:`build_schema`
         """
-        schema = Schema(self.schemas)
-        schema.generate()
         schema.schema_definitions.extend(self.schema_definitions)
-        schema.write(self.models_path)
+        write_file(self.models_path, schema.render())
+        self.generated_files.append(self.models_path)
+
+    def format_files(self) -> None:
+        """
+        Run isort and black over all the files we generated, in a single
+        pass with a single shared :py:class:`black.Mode`.  Doing this once
+        at the end of generation amortizes the formatter setup cost instead
+        of paying it for every manager file.  isort runs in memory via
+        :py:func:`isort.code` rather than ``sort_file``, which would re-read
+        and re-write the file, and the result is written back with one
+        encode.
+        """
+        for file in self.generated_files:
+            text = black.format_str(isort.code(file.read_text()), mode=_BLACK_MODE)
+            write_file(file, text)
 
     def generate(self) -> None:
         """
         Generate the Python API client project.
         """
         self.generate_module()
-        # This needs to come before generating the models.py file, because
-        # in building the managers we will discover mode schemas that need
-        # to be included
-        self.generate_managers()
-        self.generate_models()
+        # Rendering the schema classes only reads the spec, so it runs
+        # concurrently with manager generation; only the final models.py
+        # write has to wait for the query param classes the managers
+        # discover.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            schema_future = executor.submit(self.build_schema)
+            managers_future = executor.submit(self.generate_managers)
+            managers_future.result()
+            schema = schema_future.result()
+        self.generate_models(schema)
+        if self.format_code:
+            self.format_files()
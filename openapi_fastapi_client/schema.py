@@ -4,9 +4,6 @@ from string import Template
 from textwrap import wrap
 from typing import Optional
 
-import black
-import isort
-
 from openapi_fastapi_client.helpers import (
     STR_FORMAT,
     TYPE_CONVERTION,
@@ -14,6 +11,7 @@ from openapi_fastapi_client.helpers import (
     function_like_name_to_class_name,
     number_constraints,
     string_constraints,
+    write_file,
 )
 
 class Schema:
@@ -98,7 +96,7 @@ class Schema:
                 case "array":
                     delimiter = ": "
                     if reference := type_info["items"].get("$ref"):
-                        ref = function_like_name_to_class_name(reference.split("/")[-1])
+                        ref = function_like_name_to_class_name(reference.rsplit("/", 1)[-1])
                         self.referenced_class.add(ref)
                         class_info["index"] = class_info["index"] + 1
                         # put the type hint in quotes to avoid linter errors if the
@@ -111,7 +109,7 @@ class Schema:
                     type_hint = "bool"
                 case "reference":
                     delimiter = ": "
-                    ref = function_like_name_to_class_name(type_info["$ref"].split("/")[-1])
+                    ref = function_like_name_to_class_name(type_info["$ref"].rsplit("/", 1)[-1])
                     self.referenced_class.add(ref)
                     class_info["index"] = class_info["index"] + 1
                     type_hint = ref
@@ -172,7 +170,11 @@ class Schema:
             validators=validators
         )
 
-    def write(self, path: Path, additional_data: list[str] = None):
+    def render(self, additional_data: list[str] = None) -> str:
+        """
+        Render our generated schema code to a single string, so callers can
+        cache the result and write it out however they like.
+        """
         data: list[str] = []
         data.extend(self.schema_imports)
         data.append("\n")
@@ -183,9 +185,12 @@ class Schema:
         data.append("\n")
         data.extend([self.create_schema_class(obj) for obj in self.data])
         data.extend(self.schema_definitions)
-        text = black.format_str("\n".join(data), mode=black.Mode())
-        #text = "\n".join(data)
+        return "\n".join(data)
 
-        with path as file:
-            file.write_text(text)
-            isort.api.sort_file(file)
+    def write(self, path: Path, additional_data: list[str] = None):
+        """
+        Write our generated schema code to ``path``.  Formatting with black
+        and isort is left to the caller, which formats all the generated
+        files in one pass.
+        """
+        write_file(path, self.render(additional_data))
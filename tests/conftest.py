@@ -12,6 +12,12 @@ def openapi_file() -> Path:
     return BASE_TEST_DIR / Path("openapi.yaml")
 
 
+@pytest.fixture(scope="session")
+def openapi_schema(openapi_file) -> dict:
+    with openapi_file.open("r") as yaml_file:
+        return yaml.load(yaml_file, Loader=yaml.CFullLoader)
+
+
 @pytest.fixture(scope="session")
 def openapi_paths(openapi_file) -> dict:
     with openapi_file.open("r") as yaml_file:
@@ -0,0 +1,112 @@
+import ast
+import copy
+import pickle
+from pathlib import Path
+
+import pytest
+
+from openapi_fastapi_client.project import ProjectGenerator
+
+#: The return annotation each manager's methods should be typed against.
+#: Cross-tag contamination (a manager typed against another tag's schemas)
+#: shows up as a failure here.
+EXPECTED_MANAGER_TYPES = {
+    "pet.py": "Optional[Pet]",
+    "store.py": "Optional[Order]",
+    "user.py": "Optional[User]",
+}
+
+
+def assert_parses(path: Path) -> None:
+    ast.parse(path.read_text(), filename=str(path))
+
+
+@pytest.mark.parametrize("client_type", ("requests", "aiohttp"))
+def test_generate_end_to_end(tmp_path, openapi_schema, client_type):
+    project = ProjectGenerator(tmp_path, "client", openapi_schema, client_type)
+    project.generate()
+
+    module_path = tmp_path / "client"
+    assert (module_path / "__init__.py").exists()
+    assert (module_path / "managers" / "__init__.py").exists()
+    assert_parses(module_path / "models.py")
+    manager_files = sorted(f.name for f in (module_path / "managers").glob("*.py"))
+    assert manager_files == ["__init__.py", "pet.py", "store.py", "user.py"]
+    for name, response_type in EXPECTED_MANAGER_TYPES.items():
+        manager = module_path / "managers" / name
+        assert_parses(manager)
+        assert response_type in manager.read_text()
+
+
+def test_generate_with_tag_filter(tmp_path, openapi_schema):
+    project = ProjectGenerator(tmp_path, "client", openapi_schema, tag_filter="^pet$")
+    project.generate()
+
+    manager_files = sorted(f.name for f in (tmp_path / "client" / "managers").glob("*.py"))
+    assert manager_files == ["__init__.py", "pet.py"]
+
+
+def test_generate_without_formatting(tmp_path, openapi_schema):
+    project = ProjectGenerator(tmp_path, "client", openapi_schema, format_code=False)
+    project.generate()
+
+    assert_parses(tmp_path / "client" / "models.py")
+    for name in EXPECTED_MANAGER_TYPES:
+        assert_parses(tmp_path / "client" / "managers" / name)
+
+
+def test_generate_skips_untagged_operations(tmp_path, openapi_schema):
+    schema = copy.deepcopy(openapi_schema)
+    del schema["paths"]["/user"]["post"]["tags"]
+    project = ProjectGenerator(tmp_path, "client", schema)
+    project.generate()
+
+    assert sorted(project.tag_operations) == ["pet", "store", "user"]
+
+
+def test_default_only_response_is_typed(tmp_path, openapi_schema):
+    project = ProjectGenerator(tmp_path, "client", openapi_schema)
+    project.generate()
+
+    # create_user's only documented response is ``default``, which must
+    # still produce a typed return instead of falling back to Any.
+    user = (tmp_path / "client" / "managers" / "user.py").read_text()
+    assert "def create_user" in user
+    assert "-> Optional[User]" in user
+
+
+def test_from_spec_file_caches_parsed_spec(tmp_path, openapi_file, openapi_schema):
+    project = ProjectGenerator.from_spec_file(
+        openapi_file, tmp_path, "client", cache_dir=tmp_path
+    )
+    cache_files = list(tmp_path.glob("*.spec.pkl"))
+    assert len(cache_files) == 1
+    cache_file = cache_files[0]
+    assert project.openapi_schema == openapi_schema
+
+    # a warm cache loads the same spec
+    warm = ProjectGenerator.from_spec_file(
+        openapi_file, tmp_path, "client", cache_dir=tmp_path
+    )
+    assert warm.openapi_schema == openapi_schema
+
+    # any unusable cache is silently rebuilt from the YAML
+    for payload in (b"garbage", pickle.dumps(42), pickle.dumps(({}, {}))):
+        cache_file.write_bytes(payload)
+        rebuilt = ProjectGenerator.from_spec_file(
+            openapi_file, tmp_path, "client", cache_dir=tmp_path
+        )
+        assert rebuilt.openapi_schema == openapi_schema
+
+
+def test_from_spec_file_with_unwritable_cache_dir(tmp_path, openapi_file, openapi_schema):
+    # caching is best effort: an unusable cache location must not crash.
+    # A regular file where the cache directory should be is unwritable as
+    # a directory no matter what user the tests run as.
+    cache_dir = tmp_path / "cache"
+    cache_dir.write_text("not a directory")
+    project = ProjectGenerator.from_spec_file(
+        openapi_file, tmp_path, "client", cache_dir=cache_dir
+    )
+    assert project.openapi_schema == openapi_schema
+    assert cache_dir.read_text() == "not a directory"